@@ -1,10 +1,55 @@
-from datetime import datetime, timedelta, date, time
-import pytz
+import mmap
+import os
+import re
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, date, time, timezone as dt_timezone
+from functools import lru_cache
+from operator import attrgetter
+from zoneinfo import ZoneInfo
 from icalendar import Calendar
 from typing import List, Dict, Any, Tuple
 from dateutil import rrule
 from dateutil.rrule import rrulestr
 from dateutil.parser import parse
+from event import Event
+
+# UNTIL value of an RRULE, in any of the ICS date/datetime forms
+_UNTIL_RE = re.compile(r'UNTIL=(\d{8}(?:T\d{6}Z?)?)')
+
+@lru_cache(maxsize=64)
+def _tz(name: str) -> ZoneInfo:
+    """Return the zoneinfo timezone for name, constructed once and cached."""
+    return ZoneInfo(name)
+
+@lru_cache(maxsize=1024)
+def _compiled_rule(rule_string: str, start_iso: str) -> rrule.rrule:
+    """Compile an RRULE for the given ISO dtstart, cached across events and calendars."""
+    return rrulestr(rule_string, dtstart=datetime.fromisoformat(start_iso))
+
+def _aligned_dtstart(rule: rrule.rrule, start_utc: datetime, window_start_utc: datetime) -> datetime | None:
+    """
+    Find a dtstart closer to the window that yields the same occurrences from there on.
+    Only DAILY and WEEKLY rules without COUNT or BYSETPOS can be re-anchored safely:
+    shifting dtstart by whole intervals keeps the time of day, weekday and interval
+    phase intact, so the expansion never has to walk the occurrences before the window.
+    Returns None when the rule cannot (or need not) be re-anchored.
+    """
+    if rule._count is not None or rule._bysetpos:
+        return None
+    if rule._freq == rrule.DAILY:
+        step = timedelta(days=rule._interval)
+    elif rule._freq == rrule.WEEKLY:
+        step = timedelta(weeks=rule._interval)
+    else:
+        return None
+
+    # Stay one full interval before the window so its first occurrence is kept
+    intervals = (window_start_utc - start_utc) // step - 1
+    if intervals <= 0:
+        return None
+    return start_utc + intervals * step
 
 def parse_ics_datetime(dtstr: str, timezone_str: str = 'UTC') -> datetime:
     """
@@ -14,20 +59,38 @@ def parse_ics_datetime(dtstr: str, timezone_str: str = 'UTC') -> datetime:
     2. Local time with hours/minutes/seconds
     3. Date-only format
     """
-    try:
-        # Handle UTC time (ends with Z)
-        if dtstr.endswith('Z'):
-            dt = datetime.strptime(dtstr, '%Y%m%dT%H%M%SZ')
-            return pytz.utc.localize(dt)
-        
-        # Handle local time with hours/minutes/seconds
-        dt = datetime.strptime(dtstr, '%Y%m%dT%H%M%S')
-        # Localize to the specified timezone
-        return pytz.timezone(timezone_str).localize(dt)
-    except ValueError:
-        # Handle date-only format (no time component)
-        dt = datetime.strptime(dtstr, '%Y%m%d')
-        return pytz.timezone(timezone_str).localize(dt)
+    # The ICS grammar is fixed (YYYYMMDD[THHMMSS[Z]]), so slice it directly
+    # instead of going through strptime's regex and locale machinery
+    year, month, day = int(dtstr[0:4]), int(dtstr[4:6]), int(dtstr[6:8])
+
+    # Handle date-only format (no time component)
+    if len(dtstr) == 8:
+        return datetime(year, month, day, tzinfo=_tz(timezone_str))
+
+    utc_time = dtstr.endswith('Z')
+    if len(dtstr) != (16 if utc_time else 15) or dtstr[8] != 'T':
+        raise ValueError(f"Invalid ICS datetime: {dtstr!r}")
+    dt = datetime(year, month, day, int(dtstr[9:11]), int(dtstr[11:13]), int(dtstr[13:15]))
+
+    # Handle UTC time (ends with Z)
+    if utc_time:
+        return dt.replace(tzinfo=dt_timezone.utc)
+
+    # Handle local time with hours/minutes/seconds, localized to the specified timezone
+    return dt.replace(tzinfo=_tz(timezone_str))
+
+@lru_cache(maxsize=8192)
+def _format_cached(epoch_min: int, timezone_str: str) -> Tuple[str, str, str, str]:
+    """
+    Format the minute starting at epoch_min * 60 in the given timezone.
+    Recurring series hit the same minutes over and over, so the strftime work is cached.
+    """
+    local_dt = datetime.fromtimestamp(epoch_min * 60, _tz(timezone_str))
+    # One strftime call for the combined string; the components are sliced out of it
+    formatted = local_dt.strftime('%A, %B %d, %Y at %I:%M %p').replace(' at 0', ' at ', 1)
+    head, _, time_str = formatted.rpartition(' at ')
+    day_of_week, _, date_str = head.partition(', ')
+    return day_of_week, date_str, time_str, formatted
 
 def format_event_time(dt: datetime, timezone_str: str) -> Dict[str, Any]:
     """
@@ -39,25 +102,49 @@ def format_event_time(dt: datetime, timezone_str: str) -> Dict[str, Any]:
     - Time string
     - Combined formatted string
     """
-    target_tz = pytz.timezone(timezone_str)
-    local_dt = dt.astimezone(target_tz)
-    day_of_week = local_dt.strftime('%A')
-    date_str = local_dt.strftime('%B %d, %Y')
-    time_str = local_dt.strftime('%I:%M %p').lstrip('0')
+    local_dt = dt.astimezone(_tz(timezone_str))
+    day_of_week, date_str, time_str, formatted = _format_cached(int(dt.timestamp()) // 60, timezone_str)
     return {
         'datetime': local_dt,
         'day_of_week': day_of_week,
         'date': date_str,
         'time': time_str,
-        'formatted': f"{day_of_week}, {date_str} at {time_str}"
+        'formatted': formatted
     }
 
+def _build_event(summary: str, start: datetime, end: datetime, duration: timedelta,
+                 timezone_str: str, **flags: bool) -> Event:
+    """
+    Build the Event returned by parse_calendar.
+    Takes only plain values (no icalendar components), so this reduction stage
+    stays a small pure-Python function that runs unchanged under PyPy.
+    Extra keyword flags (e.g. is_recurring, is_single) are passed to Event as-is.
+    """
+    # Use the cached components directly rather than building format_event_time dicts
+    target_tz = _tz(timezone_str)
+    utc = dt_timezone.utc
+    day_of_week, date_str, start_time, formatted_start = _format_cached(int(start.timestamp()) // 60, timezone_str)
+    _, _, end_time, formatted_end = _format_cached(int(end.timestamp()) // 60, timezone_str)
+    return Event(
+        summary=summary,
+        # Occurrences arrive in UTC from the rule expansion; only convert what isn't already there
+        start_utc=start if start.tzinfo is utc else start.astimezone(utc),
+        end_utc=end if end.tzinfo is utc else end.astimezone(utc),
+        start_local=start if start.tzinfo is target_tz else start.astimezone(target_tz),
+        end_local=end if end.tzinfo is target_tz else end.astimezone(target_tz),
+        formatted_start=formatted_start,
+        formatted_end=formatted_end,
+        formatted_time=f"{day_of_week}, {date_str} from {start_time} to {end_time} ({timezone_str} time)",
+        duration_minutes=int(duration.total_seconds() / 60),
+        **flags
+    )
+
 def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ahead: int = 7, 
-                  timezone: str = 'UTC', debug: bool = False) -> List[Dict[str, Any]]:
+                  timezone: str = 'UTC', debug: bool = False) -> List[Event]:
     """
     Main function to parse an ICS calendar file and extract events.
     Uses a two-pass approach to handle recurring events with modifications:
-    1. First pass: Build recurring series
+    1. First pass: Build recurring series (single events are added directly)
     2. Second pass: Apply modifications (EXDATE and RECURRENCE-ID)
     """
     if debug:
@@ -66,8 +153,10 @@ def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ah
     
     # Read and parse the ICS file
     try:
-        with open(ics_filepath, 'rb') as f:
-            cal = Calendar.from_ical(f.read())
+        # Map the file so large calendars are paged in by the OS and copied
+        # once into the bytes handed to icalendar, not read through a buffer
+        with open(ics_filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            cal = Calendar.from_ical(mm[:])
     except FileNotFoundError:
         print(f"Error: The file '{ics_filepath}' was not found.")
         return []
@@ -83,25 +172,29 @@ def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ah
     if debug:
         print(f"Calendar timezone: {cal_timezone}")
 
+    # Resolve timezones once for the whole parse
+    cal_tz = _tz(cal_timezone)
+    utc = dt_timezone.utc
+
     # Set the date window for event filtering
     if start_date_str:
         try:
             parsed_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
             window_start = datetime.combine(parsed_date, time(0, 0))
-            window_start = pytz.timezone(cal_timezone).localize(window_start)
+            window_start = window_start.replace(tzinfo=cal_tz)
         except ValueError:
-            window_start = datetime.now(pytz.timezone(cal_timezone))
+            window_start = datetime.now(cal_tz)
     else:
-        window_start = datetime.now(pytz.timezone(cal_timezone))
+        window_start = datetime.now(cal_tz)
 
     window_end = window_start + timedelta(days=days_ahead)
     if debug:
         print(f"Window: {window_start} to {window_end}")
 
-    # First pass: Build recurring series and collect modifications
-    recurring_events = {}  # uid -> (original_event, modifications)
+    # First pass: Build recurring series, collect modifications and add single events
+    recurring_events = {}  # uid -> (summary, start_dt, end_dt, rule_string, exdate_ts)
     modifications = {}     # uid -> {recurrence_id: modified_event}
-    single_events = []     # Non-recurring events
+    events = []
 
     for component in cal.walk():
         if component.name != 'VEVENT':
@@ -123,7 +216,7 @@ def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ah
             
             # Localize start time to calendar timezone
             if start_dt.tzinfo is None:
-                start_dt = pytz.timezone(cal_timezone).localize(start_dt)
+                start_dt = start_dt.replace(tzinfo=cal_tz)
             
             # Process end time
             dtend = component.get('DTEND')
@@ -139,7 +232,7 @@ def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ah
                     end_dt = datetime.combine(end_dt, time(0, 0))
                 
                 if end_dt.tzinfo is None:
-                    end_dt = pytz.timezone(cal_timezone).localize(end_dt)
+                    end_dt = end_dt.replace(tzinfo=cal_tz)
 
             # Check if this is a recurring event
             rrule_prop = component.get('RRULE')
@@ -151,14 +244,32 @@ def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ah
                         modifications[uid] = {}
                     modifications[uid][recurrence_id.dt] = component
                 else:
-                    # This is the original recurring event
-                    recurring_events[uid] = (component, [])
+                    # This is the original recurring event; parse everything the
+                    # second pass needs now so it never goes back to the component
+                    rule_string = rrule_prop.to_ical().decode('utf-8')
+
+                    # Get exception dates; EXDATE is a single vDDDLists or a list of them
+                    # (one per EXDATE line), each holding one or more dates in .dts
+                    raw_exdates = component.get('EXDATE', [])
+                    if not isinstance(raw_exdates, list):
+                        raw_exdates = [raw_exdates]
+                    exdates = []
+                    for exdate in raw_exdates:
+                        for dt in (value.dt for value in exdate.dts):
+                            if dt.tzinfo is None:
+                                dt = dt.replace(tzinfo=cal_tz)
+                            exdates.append(dt.astimezone(utc))
+                    # Sorted epoch seconds allow a binary search per occurrence
+                    exdate_ts = sorted(int(exdate.timestamp()) for exdate in exdates)
+
+                    recurring_events[uid] = (summary, start_dt, end_dt, rule_string, exdate_ts)
             else:
                 # Non-recurring event
                 if (window_start <= start_dt < window_end or 
                     window_start <= end_dt < window_end or
                     (start_dt <= window_start and end_dt >= window_end)):
-                    single_events.append(component)
+                    events.append(_build_event(summary, start_dt, end_dt, end_dt - start_dt, timezone,
+                                               is_single=True))
 
         except Exception as e:
             if debug:
@@ -166,57 +277,45 @@ def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ah
             continue
 
     # Second pass: Process recurring events and apply modifications
-    events = []
-    
-    for uid, (component, _) in recurring_events.items():
+    window_start_utc = window_start.astimezone(utc)
+    window_end_utc = window_end.astimezone(utc)
+
+    for uid, (summary, start_dt, end_dt, rule_string, exdate_ts) in recurring_events.items():
         try:
-            # Get basic event information
-            summary = str(component.get('SUMMARY', 'Untitled Event'))
-            
-            # Process start and end times
-            dtstart = component.get('DTSTART')
-            dtend = component.get('DTEND')
-            start_dt = dtstart.dt
-            end_dt = dtend.dt if dtend else start_dt + timedelta(hours=1)
-            
-            # Localize times if needed
-            if start_dt.tzinfo is None:
-                start_dt = pytz.timezone(cal_timezone).localize(start_dt)
-            if end_dt.tzinfo is None:
-                end_dt = pytz.timezone(cal_timezone).localize(end_dt)
-            
-            # Get exception dates
-            exdates = []
-            for exdate in component.get('EXDATE', []):
-                if isinstance(exdate.dt, list):
-                    for dt in exdate.dt:
-                        if dt.tzinfo is None:
-                            dt = pytz.timezone(cal_timezone).localize(dt)
-                        exdates.append(dt.astimezone(pytz.utc))
-                else:
-                    dt = exdate.dt
-                    if dt.tzinfo is None:
-                        dt = pytz.timezone(cal_timezone).localize(dt)
-                    exdates.append(dt.astimezone(pytz.utc))
-            
+            # Skip series that start after the window or end before it, without expanding them
+            start_utc = start_dt.astimezone(utc)
+            if start_utc > window_end_utc:
+                continue
+            until_match = _UNTIL_RE.search(rule_string)
+            if until_match and parse_ics_datetime(until_match.group(1), cal_timezone) < window_start_utc:
+                continue
+
             # Parse recurrence rule
-            rule_string = component.get('RRULE').to_ical().decode('utf-8')
-            start_utc = start_dt.astimezone(pytz.utc)
-            rule = rrulestr(rule_string, dtstart=start_utc)
+            rule = _compiled_rule(rule_string, start_utc.isoformat())
             
             # Get all occurrences within the window
-            window_start_utc = window_start.astimezone(pytz.utc)
-            window_end_utc = window_end.astimezone(pytz.utc)
+            # Re-anchor long-running series next to the window to skip expanding their past
+            aligned_start = _aligned_dtstart(rule, start_utc, window_start_utc)
+            if aligned_start is not None:
+                rule = _compiled_rule(rule_string, aligned_start.isoformat())
             occurrences = list(rule.between(window_start_utc, window_end_utc, inc=True))
             
+            # Most series have no modified occurrences, so only probe when there are some
+            mods_for_uid = modifications.get(uid)
+
+            # Unmodified occurrences all share the original event's duration
+            default_duration = end_dt - start_dt
+
             # Process each occurrence
             for occurrence in occurrences:
                 # Skip if this occurrence is in the exception dates
-                if any(abs((occurrence - exdate).total_seconds()) < 60 for exdate in exdates):
+                occurrence_ts = int(occurrence.timestamp())
+                i = bisect_left(exdate_ts, occurrence_ts)
+                if any(abs(occurrence_ts - ts) < 60 for ts in exdate_ts[max(i - 1, 0):i + 1]):
                     continue
                 
                 # Check if this occurrence has been modified
-                modified_component = modifications.get(uid, {}).get(occurrence.astimezone(pytz.timezone(cal_timezone)))
+                modified_component = mods_for_uid.get(occurrence.astimezone(cal_tz)) if mods_for_uid else None
                 if modified_component:
                     # Use the modified event's details
                     mod_dtstart = modified_component.get('DTSTART')
@@ -225,9 +324,9 @@ def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ah
                     mod_end_dt = mod_dtend.dt if mod_dtend else mod_start_dt + timedelta(hours=1)
                     
                     if mod_start_dt.tzinfo is None:
-                        mod_start_dt = pytz.timezone(cal_timezone).localize(mod_start_dt)
+                        mod_start_dt = mod_start_dt.replace(tzinfo=cal_tz)
                     if mod_end_dt.tzinfo is None:
-                        mod_end_dt = pytz.timezone(cal_timezone).localize(mod_end_dt)
+                        mod_end_dt = mod_end_dt.replace(tzinfo=cal_tz)
                     
                     # Use modified times
                     occurrence = mod_start_dt
@@ -235,84 +334,44 @@ def parse_calendar(ics_filepath: str, start_date_str: str | None = None, days_ah
                     duration = mod_end_dt - mod_start_dt
                 else:
                     # Use original event's duration
-                    duration = end_dt - start_dt
-                    # Calculate the time difference between original start and this occurrence
-                    time_diff = occurrence - start_dt.astimezone(pytz.utc)
+                    duration = default_duration
                     # Add the duration to the occurrence time, preserving the original duration
                     occurrence_end = occurrence + duration
                 
-                # Convert to target timezone
-                occurrence = occurrence.astimezone(pytz.timezone(timezone))
-                occurrence_end = occurrence_end.astimezone(pytz.timezone(timezone))
-                
-                # Format times for display
-                start_format = format_event_time(occurrence, timezone)
-                end_format = format_event_time(occurrence_end, timezone)
-                duration_minutes = int(duration.total_seconds() / 60)
-                
                 # Add event to list
-                events.append({
-                    'summary': summary,
-                    'start_utc': occurrence.astimezone(pytz.utc),
-                    'end_utc': occurrence_end.astimezone(pytz.utc),
-                    'start_local': start_format['datetime'],
-                    'end_local': end_format['datetime'],
-                    'formatted_start': start_format['formatted'],
-                    'formatted_end': end_format['formatted'],
-                    'formatted_time': f"{start_format['day_of_week']}, {start_format['date']} from {start_format['time']} to {end_format['time']} ({timezone} time)",
-                    'duration_minutes': duration_minutes,
-                    'is_recurring': True,
-                    'is_modified': modified_component is not None
-                })
+                events.append(_build_event(summary, occurrence, occurrence_end, duration, timezone,
+                                           is_recurring=True,
+                                           is_modified=modified_component is not None))
                 
         except Exception as e:
             if debug:
                 print(f"Error processing recurring event: {e}")
             continue
 
-    # Add non-recurring events
-    for component in single_events:
-        try:
-            summary = str(component.get('SUMMARY', 'Untitled Event'))
-            dtstart = component.get('DTSTART')
-            dtend = component.get('DTEND')
-            
-            start_dt = dtstart.dt
-            end_dt = dtend.dt if dtend else start_dt + timedelta(hours=1)
-            
-            if start_dt.tzinfo is None:
-                start_dt = pytz.timezone(cal_timezone).localize(start_dt)
-            if end_dt.tzinfo is None:
-                end_dt = pytz.timezone(cal_timezone).localize(end_dt)
-            
-            # Format times for display
-            start_format = format_event_time(start_dt, timezone)
-            end_format = format_event_time(end_dt, timezone)
-            duration_minutes = int((end_dt - start_dt).total_seconds() / 60)
-            
-            # Add event to list
-            events.append({
-                'summary': summary,
-                'start_utc': start_dt.astimezone(pytz.utc),
-                'end_utc': end_dt.astimezone(pytz.utc),
-                'start_local': start_format['datetime'],
-                'end_local': end_format['datetime'],
-                'formatted_start': start_format['formatted'],
-                'formatted_end': end_format['formatted'],
-                'formatted_time': f"{start_format['day_of_week']}, {start_format['date']} from {start_format['time']} to {end_format['time']} ({timezone} time)",
-                'duration_minutes': duration_minutes,
-                'is_single': True
-            })
-            
-        except Exception as e:
-            if debug:
-                print(f"Error processing single event: {e}")
-            continue
-
     return events
 
+# Below this combined file size parse_multiple_calendars parses in-process: the pool's
+# startup costs more than it saves, and the rule/timezone caches stay warm across calls
+_PARALLEL_MIN_BYTES = 1 << 20
+
+# Worker processes for parse_multiple_calendars, started on first use and kept, so each
+# worker's caches survive across calls
+_pool = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the module's process pool, starting it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _pool
+
+def _discard_pool() -> None:
+    """Drop the module's process pool (e.g. after a worker died); the next use starts a new one."""
+    global _pool
+    _pool = None
+
 def parse_multiple_calendars(calendar_files: List[Tuple[str, str]], start_date_str: str | None = None, 
-                            days_ahead: int = 7, timezone: str = 'UTC') -> List[Dict[str, Any]]:
+                            days_ahead: int = 7, timezone: str = 'UTC') -> List[Event]:
     """
     Parse multiple calendar files and combine their events.
     Parameters:
@@ -322,22 +381,44 @@ def parse_multiple_calendars(calendar_files: List[Tuple[str, str]], start_date_s
     - timezone: Target timezone
     
     Returns a combined list of events from all calendars, sorted by start time
+
+    Several files totalling at least _PARALLEL_MIN_BYTES are parsed in a process pool
+    that is kept for later calls. On platforms that start processes with spawn (macOS,
+    Windows), the calling script must then guard its entry point with
+    if __name__ == "__main__":, or starting the workers raises a RuntimeError.
     """
     all_events = []
     
+    # Parsing is CPU-bound and independent per file, so large sets of files are spread
+    # across processes
+    # Missing files count as empty here; parse_calendar reports and skips them
+    total_bytes = sum(os.path.getsize(file_path) for file_path, _ in calendar_files
+                      if os.path.isfile(file_path))
+    if len(calendar_files) > 1 and total_bytes >= _PARALLEL_MIN_BYTES:
+        pool = _get_pool()
+        try:
+            futures = [pool.submit(parse_calendar, file_path, start_date_str, days_ahead, timezone)
+                       for file_path, _ in calendar_files]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            _discard_pool()
+            raise
+    else:
+        results = [parse_calendar(file_path, start_date_str, days_ahead, timezone)
+                   for file_path, _ in calendar_files]
+
     # Process each calendar file
-    for file_path, calendar_name in calendar_files:
-        events = parse_calendar(file_path, start_date_str, days_ahead, timezone)
+    for (_, calendar_name), events in zip(calendar_files, results):
         # Add calendar name to each event
         for event in events:
-            event['calendar_name'] = calendar_name
+            event.calendar_name = calendar_name
         all_events.extend(events)
     
     # Sort all events by start time
-    all_events.sort(key=lambda event: event['start_utc'])
+    all_events.sort(key=attrgetter('start_utc'))
     return all_events
 
-def print_events(events: List[Dict[str, Any]], show_details: bool = False) -> None:
+def print_events(events: List[Event], show_details: bool = False) -> None:
     """
     Print events in a formatted way.
     Parameters:
@@ -353,14 +434,14 @@ def print_events(events: List[Dict[str, Any]], show_details: bool = False) -> No
     
     # Print each event
     for i, event in enumerate(events, 1):
-        print(f"{i}. [{event['calendar_name']}] {event['summary']}")
-        print(f"   {event['formatted_time']}")
+        print(f"{i}. [{event.calendar_name}] {event.summary}")
+        print(f"   {event.formatted_time}")
         
         # Print detailed information if requested
         if show_details:
-            duration_hours = event['duration_minutes'] / 60
-            duration_str = f"{duration_hours:.1f} hours" if duration_hours >= 1 else f"{event['duration_minutes']} minutes"
+            duration_hours = event.duration_minutes / 60
+            duration_str = f"{duration_hours:.1f} hours" if duration_hours >= 1 else f"{event.duration_minutes} minutes"
             print(f"   Duration: {duration_str}")
-            print(f"   Start: {event['start_local'].isoformat()}")
-            print(f"   End: {event['end_local'].isoformat()}")
+            print(f"   Start: {event.start_local.isoformat()}")
+            print(f"   End: {event.end_local.isoformat()}")
         print()
\ No newline at end of file
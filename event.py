@@ -0,0 +1,33 @@
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict
+
+@dataclass(slots=True)
+class Event:
+    """
+    A single calendar event (or occurrence of a recurring one) in the requested window.
+    Shared by the ICS parser, the Google Calendar fetch and the scheduling loop, so not
+    every source fills in every field.
+    """
+    summary: str
+    start_utc: datetime
+    end_utc: datetime
+    start_local: datetime
+    end_local: datetime
+    formatted_start: str = ''
+    formatted_end: str = ''
+    formatted_time: str = ''
+    duration_minutes: int = 0
+    is_recurring: bool = False
+    is_modified: bool = False
+    is_single: bool = False
+    is_new: bool = False
+    calendar_name: str = ''
+    # Local HH:MM / YYYY-MM-DD HH:MM display strings, filled in where already at hand
+    start_hm: str = ''
+    end_hm: str = ''
+    start_ymd_hm: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the event as a plain dictionary, as earlier versions of the parser did."""
+        return asdict(self)
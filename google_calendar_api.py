@@ -5,14 +5,29 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build 
 from googleapiclient.errors import HttpError 
+from operator import attrgetter
 from typing import List, Dict, Any
 import pytz
 from datetime import datetime, timedelta, time
+from event import Event
+
+# ciso8601 parses RFC 3339 timestamps in C; fall back to fromisoformat when it isn't installed
+try:
+    from ciso8601 import parse_rfc3339 as _parse_rfc3339
+except ImportError:
+    def _parse_rfc3339(value: str) -> datetime:
+        """Parses an RFC 3339 timestamp, accepting a trailing 'Z' for UTC."""
+        return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 TOKEN_PATH = "token.json" 
 CREDENTIALS_PATH = "credentials.json" 
 
+# The Calendar API service and the access token it was built for, so the discovery
+# document is only fetched again after the token changes
+_service = None
+_service_token = None
+
 def format_event_time(dt: datetime, timezone_str: str) -> Dict[str, Any]:
     """
     Format a datetime for human-readable display in a specific timezone.
@@ -114,6 +129,26 @@ def get_calendar_credentials():
          print("Failed to obtain valid credentials.")
          return None
 
+def _get_service(creds):
+    """Returns a Calendar API service for the credentials, rebuilding it only when the token changes."""
+    global _service, _service_token
+    if _service is None or _service_token != creds.token:
+        _service = build('calendar', 'v3', credentials=creds)
+        _service_token = creds.token
+    return _service
+
+# The Calendar API accepts at most 50 calls per batch request, and each calendar takes two
+_MAX_BATCH_CALENDARS = 25
+
+def _iter_event_items(service, events_result: dict, **list_kwargs):
+    """Yields the items of an events().list() response, fetching any further pages as needed."""
+    while True:
+        yield from events_result.get('items', [])
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            return
+        events_result = service.events().list(pageToken=page_token, **list_kwargs).execute()
+
 def create_event_from_llm_suggestion(event_data: dict, title: str, timezone: str = 'UTC') -> dict:
     """
     Creates a Google Calendar event from LLM suggestion data in the specified timezone.
@@ -135,7 +170,7 @@ def create_event_from_llm_suggestion(event_data: dict, title: str, timezone: str
         raise Exception("Failed to get valid credentials")
     
     try:
-        service = build('calendar', 'v3', credentials=creds)
+        service = _get_service(creds)
         
         # Ensure start_time is in the target timezone
         target_tz = pytz.timezone(timezone)
@@ -170,7 +205,7 @@ def create_event_from_llm_suggestion(event_data: dict, title: str, timezone: str
         print(f"An unexpected error occurred: {e}")
         return None
 
-def get_events_from_google_calendar(start_date_str: str | None = None, days_ahead: int = 7, timezone: str = 'UTC', calendar_ids: List[str] | None = None) -> List[Dict[str, Any]]:
+def get_events_from_google_calendar(start_date_str: str | None = None, days_ahead: int = 7, timezone: str = 'UTC', calendar_ids: List[str] | None = None) -> List[Event]:
     """
     Fetch events from Google Calendar API and convert them to the target timezone.
     
@@ -181,14 +216,14 @@ def get_events_from_google_calendar(start_date_str: str | None = None, days_ahea
         calendar_ids: List of calendar IDs to fetch events from. If None, uses primary calendar.
     
     Returns:
-        List of events in the target timezone
+        List of Event objects in the target timezone, ordered by start time
     """
     creds = get_calendar_credentials()
     if not creds:
         raise Exception("Failed to get valid credentials")
     
     try:
-        service = build('calendar', 'v3', credentials=creds)
+        service = _get_service(creds)
         
         # Set the date window for event filtering
         if start_date_str:
@@ -213,27 +248,50 @@ def get_events_from_google_calendar(start_date_str: str | None = None, days_ahea
         if calendar_ids is None:
             calendar_ids = ['primary']
         
-        all_events = []
+        list_kwargs = {
+            'timeMin': time_min,
+            'timeMax': time_max,
+            'singleEvents': True,
+            'orderBy': 'startTime'
+        }
         
-        # Fetch events from each calendar
-        for calendar_id in calendar_ids:
+        # Fetch calendar names and first event pages in batched HTTP requests,
+        # two calls per calendar and at most _MAX_BATCH_CALENDARS calendars per batch
+        responses = {}
+
+        def store_response(request_id, response, exception):
+            responses[request_id] = (response, exception)
+
+        for batch_start in range(0, len(calendar_ids), _MAX_BATCH_CALENDARS):
+            batch = service.new_batch_http_request(callback=store_response)
+            batch_indices = range(batch_start, min(batch_start + _MAX_BATCH_CALENDARS, len(calendar_ids)))
+            for i in batch_indices:
+                calendar_id = calendar_ids[i]
+                batch.add(service.calendars().get(calendarId=calendar_id), request_id=f"calendar-{i}")
+                batch.add(service.events().list(calendarId=calendar_id, **list_kwargs), request_id=f"events-{i}")
             try:
+                batch.execute()
+            except Exception as e:
+                # A failed batch only costs its own calendars, which report the error below
+                for i in batch_indices:
+                    responses.setdefault(f"calendar-{i}", (None, e))
+                    responses.setdefault(f"events-{i}", (None, e))
+        
+        # Process the events of each calendar; first pages came with the batch, so only
+        # calendars with more events than fit on one page make further requests
+        all_events = []
+        for i, calendar_id in enumerate(calendar_ids):
+            try:
+                calendar, calendar_error = responses[f"calendar-{i}"]
+                events_result, events_error = responses[f"events-{i}"]
+                if calendar_error or events_error:
+                    raise calendar_error or events_error
+
                 # Get calendar name
-                calendar = service.calendars().get(calendarId=calendar_id).execute()
                 calendar_name = calendar.get('summary', 'Unknown Calendar')
-                
-                # Fetch events from this calendar
-                events_result = service.events().list(
-                    calendarId=calendar_id,
-                    timeMin=time_min,
-                    timeMax=time_max,
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                
-                events = events_result.get('items', [])
-                
-                for event in events:
+
+                # Follow nextPageToken so calendars with more than one page aren't truncated
+                for event in _iter_event_items(service, events_result, calendarId=calendar_id, **list_kwargs):
                     try:
                         # Get start and end times
                         start = event['start'].get('dateTime', event['start'].get('date'))
@@ -241,8 +299,8 @@ def get_events_from_google_calendar(start_date_str: str | None = None, days_ahea
                         
                         # Convert to datetime objects
                         if 'dateTime' in event['start']:
-                            start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                            end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
+                            start_dt = _parse_rfc3339(start)
+                            end_dt = _parse_rfc3339(end)
                         else:
                             start_dt = datetime.combine(datetime.fromisoformat(start).date(), time(0, 0))
                             end_dt = datetime.combine(datetime.fromisoformat(end).date(), time(0, 0))
@@ -267,19 +325,23 @@ def get_events_from_google_calendar(start_date_str: str | None = None, days_ahea
                         is_recurring = 'recurringEventId' in event
                         
                         # Add event to list
-                        all_events.append({
-                            'summary': event.get('summary', 'Untitled Event'),
-                            'start_utc': start_dt.astimezone(pytz.utc),
-                            'end_utc': end_dt.astimezone(pytz.utc),
-                            'start_local': start_format['datetime'],
-                            'end_local': end_format['datetime'],
-                            'formatted_start': start_format['formatted'],
-                            'formatted_end': end_format['formatted'],
-                            'formatted_time': f"{start_format['day_of_week']}, {start_format['date']} from {start_format['time']} to {end_format['time']} ({timezone} time)",
-                            'duration_minutes': duration_minutes,
-                            'is_recurring': is_recurring,
-                            'calendar_name': calendar_name
-                        })
+                        all_events.append(Event(
+                            summary=event.get('summary', 'Untitled Event'),
+                            start_utc=start_dt.astimezone(pytz.utc),
+                            end_utc=end_dt.astimezone(pytz.utc),
+                            start_local=start_format['datetime'],
+                            end_local=end_format['datetime'],
+                            formatted_start=start_format['formatted'],
+                            formatted_end=end_format['formatted'],
+                            formatted_time=f"{start_format['day_of_week']}, {start_format['date']} from {start_format['time']} to {end_format['time']} ({timezone} time)",
+                            duration_minutes=duration_minutes,
+                            is_recurring=is_recurring,
+                            calendar_name=calendar_name,
+                            # Display strings, formatted once here for the LLM listing and schedule print
+                            start_hm=f"{start_dt:%H:%M}",
+                            end_hm=f"{end_dt:%H:%M}",
+                            start_ymd_hm=f"{start_dt:%Y-%m-%d %H:%M}"
+                        ))
                     except Exception as e:
                         print(f"Error processing event {event.get('summary', 'Unknown')} from calendar {calendar_name}: {e}")
                         continue
@@ -287,8 +349,11 @@ def get_events_from_google_calendar(start_date_str: str | None = None, days_ahea
                 print(f"Error fetching events from calendar {calendar_id}: {e}")
                 continue
         
-        # Sort all events by start time
-        all_events.sort(key=lambda event: event['start_utc'])
+        # Sort the combined events by start time. A calendar's own events aren't always in
+        # UTC order (the API orders all-day events by date in the calendar's timezone,
+        # while they are localized to the target timezone here), so they can't simply be
+        # merged; timsort is still near-linear on the presorted runs
+        all_events.sort(key=attrgetter('start_utc'))
         return all_events
         
     except HttpError as error:
@@ -1,13 +1,68 @@
+import asyncio
+import hashlib
 import os
-from datetime import datetime, timedelta
+import re
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import pytz
-import google.generativeai as genai
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Tuple
 from dotenv import load_dotenv
+from event import Event
 
 load_dotenv()
 
-def format_events_for_llm(events: List[Dict[str, Any]], timezone: str = 'UTC') -> str:
+MODEL_NAME = 'gemini-2.0-flash-thinking-exp-01-21'
+
+@lru_cache(maxsize=64)
+def _tz(name: str) -> pytz.BaseTzInfo:
+    """Returns the pytz timezone for name, constructed once and cached."""
+    return pytz.timezone(name)
+
+# Configured once per process by _get_model(). The model keeps its sync and async
+# gRPC clients after the first call, so every request reuses the same HTTP/2 channel.
+_model = None
+_model_lock = threading.Lock()
+
+def _get_model():
+    """
+    Returns the Gemini model, configuring the client on first use.
+    Returns None on error; a failed setup is retried on the next call.
+    """
+    global _model
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is not None:
+            return _model
+
+        try:
+            api_key = os.getenv('GOOGLE_API_KEY')
+            if not api_key:
+                print("Error: GOOGLE_API_KEY not found in environment variables.")
+                return None
+        except Exception as e:
+            print(f"Error reading environment variable: {e}")
+            return None
+
+        try:
+            # Imported here so loading this module doesn't pull in the Gemini SDK
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+        except Exception as e:
+            print(f"Error configuring Google AI client: {e}")
+            return None
+
+        try:
+            _model = genai.GenerativeModel(MODEL_NAME)
+        except Exception as e:
+            print(f"Error initializing generative model: {e}")
+            return None
+
+        return _model
+
+def format_events_for_llm(events: List[Event], timezone: str = 'UTC') -> str:
     """
     Format events in a concise, LLM-friendly format.
     Returns a structured string with clear event information in local time.
@@ -16,71 +71,32 @@ def format_events_for_llm(events: List[Dict[str, Any]], timezone: str = 'UTC') -
         return "No events found in the specified time period."
     
     # Get current time in local timezone
-    current_time = datetime.now(pytz.timezone(timezone))
-    current_time_str = current_time.strftime('%Y-%m-%d %H:%M')
+    current_time = datetime.now(_tz(timezone))
     
     # Get date range from first and last events in local time
-    start_date = events[0]['start_local'].strftime('%Y-%m-%d')
-    end_date = events[-1]['start_local'].strftime('%Y-%m-%d')
+    first_start = events[0].start_local
+    last_start = events[-1].start_local
     
-    output = [
-        f"Current Time ({timezone}): {current_time_str}",
-        f"Schedule Context ({timezone}): {start_date} to {end_date}",
-        f"\nEvents:"
+    lines = [
+        f"Current Time ({timezone}): {current_time:%Y-%m-%d %H:%M}",
+        f"Schedule Context ({timezone}): {first_start:%Y-%m-%d} to {last_start:%Y-%m-%d}",
+        "\nEvents:",
     ]
-    
+    # The display strings cached at fetch time are used when present, otherwise formatted here
     for event in events:
-        # Format the time range in local time
-        start_time = event['start_local'].strftime('%Y-%m-%d %H:%M')
-        end_time = event['end_local'].strftime('%H:%M')
-        
-        # Build event description
-        desc = event['summary']
-        if event.get('is_recurring'):
+        start_str = event.start_ymd_hm or f"{event.start_local:%Y-%m-%d %H:%M}"
+        end_str = event.end_hm or f"{event.end_local:%H:%M}"
+        desc = event.summary
+        if event.is_recurring:
             desc += " (Recurring)"
-        if event['calendar_name'] != 'Main':
-            desc += f" (from {event['calendar_name']} Calendar)"
-        
-        output.append(f"{start_time} - {end_time}: {desc}")
-    
-    return "\n".join(output)
-
-def get_llm_suggestion(schedule_context: str, user_request: str, timezone: str = 'UTC', feedback_history: List[str] | None = None) -> str | None:
-    """
-    Sends schedule context and user request to the Gemini API
-    and returns the raw text response. Returns None on error.
-    """
-    try:
-        api_key = os.getenv('GOOGLE_API_KEY')
-        if not api_key:
-            print("Error: GOOGLE_API_KEY not found in environment variables.")
-            return None
-    except Exception as e:
-        print(f"Error reading environment variable: {e}")
-        return None
+        if event.calendar_name != 'Main':
+            desc += f" (from {event.calendar_name} Calendar)"
+        lines.append(f"{start_str} - {end_str}: {desc}")
 
-    try:
-        genai.configure(api_key=api_key)
-    except Exception as e:
-        print(f"Error configuring Google AI client: {e}")
-        return None
+    return "\n".join(lines)
 
-    try:
-        model_name = 'gemini-2.0-flash-thinking-exp-01-21'
-        model = genai.GenerativeModel(model_name)
-        print(f"Gemini model '{model_name}' initialized.")
-    except Exception as e:
-        print(f"Error initializing generative model: {e}")
-        return None
-
-    # Format feedback history for the prompt
-    feedback_text = "No feedback provided"
-    if feedback_history and len(feedback_history) > 0:
-        feedback_text = "Feedback History:\n"
-        for i, feedback in enumerate(feedback_history, 1):
-            feedback_text += f"{i}. {feedback}\n"
-
-    prompt = f"""You are a calendar scheduling assistant. Your task is to suggest the best time for a new event based on the user's request and existing schedule.
+# Static prompt, filled in per request with str.format
+_PROMPT_TEMPLATE = """You are a calendar scheduling assistant. Your task is to suggest the best time for a new event based on the user's request and existing schedule.
 
 RULES:
 1. Only suggest ONE time slot
@@ -143,13 +159,262 @@ HH:MM - HH:MM: Event 2
 
 [DO NOT include anything else in your response]"""
 
+# Raw responses by prompt hash, so an identical request is answered without an API call
+_response_cache: Dict[str, str] = {}
+
+def _cache_key(prompt: str) -> str:
+    """Returns the response cache key for a finished prompt."""
+    return hashlib.blake2b(prompt.encode()).hexdigest()
+
+def _build_prompt(schedule_context: str, user_request: str, timezone: str, feedback_history: List[str] | None) -> str:
+    """Fills the prompt template with the schedule, request and feedback history."""
+    # Format feedback history for the prompt
+    feedback_text = "Feedback History:\n" + "\n".join(
+        f"{i}. {feedback}" for i, feedback in enumerate(feedback_history, 1)
+    ) if feedback_history else "No feedback provided"
+
+    return _PROMPT_TEMPLATE.format(
+        timezone=timezone,
+        schedule_context=schedule_context,
+        user_request=user_request,
+        feedback_text=feedback_text
+    )
+
+async def _read_stream(response, on_chunk: Callable[[str], None] | None = None) -> str:
+    """Collects a streamed response's text, passing each piece to on_chunk as it arrives."""
+    chunks = []
+    async for chunk in response:
+        chunks.append(chunk.text)
+        if on_chunk is not None:
+            on_chunk(chunk.text)
+    await response.resolve()
+    return "".join(chunks)
+
+async def get_llm_suggestion_async(schedule_context: str, user_request: str, timezone: str = 'UTC', feedback_history: List[str] | None = None, disable_cache: bool = False) -> str | None:
+    """
+    Sends schedule context and user request to the Gemini API using the SDK's native
+    non-blocking call, so several suggestions can be requested concurrently, and
+    returns the raw text response. Returns None on error.
+    Responses are cached by prompt; pass disable_cache=True to always call the API.
+    """
+    prompt = _build_prompt(schedule_context, user_request, timezone, feedback_history)
+    cache_key = _cache_key(prompt)
+    if not disable_cache and cache_key in _response_cache:
+        return _response_cache[cache_key]
+
+    model = _get_model()
+    if model is None:
+        return None
+
     try:
+        response = await model.generate_content_async(prompt)
+        _response_cache[cache_key] = response.text
+        return response.text
+    except Exception as e:
+        print(f"An unexpected error occurred while calling GenAI API: {e}")
+        return None
+
+def get_llm_suggestion(schedule_context: str, user_request: str, timezone: str = 'UTC', feedback_history: List[str] | None = None, disable_cache: bool = False) -> str | None:
+    """
+    Blocking version of get_llm_suggestion_async for callers without an event loop.
+    Returns the raw text response, or None on error.
+    Responses are cached by prompt; pass disable_cache=True to always call the API.
+    """
+    prompt = _build_prompt(schedule_context, user_request, timezone, feedback_history)
+    cache_key = _cache_key(prompt)
+    if not disable_cache and cache_key in _response_cache:
+        return _response_cache[cache_key]
+
+    model = _get_model()
+    if model is None:
+        return None
+
+    try:
+        # Not asyncio.run(get_llm_suggestion_async(...)): the model keeps its async gRPC
+        # client, which is bound to the event loop of the first call
         response = model.generate_content(prompt)
+        _response_cache[cache_key] = response.text
         return response.text
     except Exception as e:
         print(f"An unexpected error occurred while calling GenAI API: {e}")
         return None
 
+async def get_llm_suggestions_batch(schedule_context: str, user_request: str, timezone: str = 'UTC', feedback_history: List[str] | None = None, preferences: Tuple[str, ...] = ('morning', 'afternoon', 'evening')) -> List[Tuple[str, str | None]]:
+    """
+    Requests one alternative suggestion per time-of-day preference, all concurrently.
+    Returns (feedback, raw response) pairs in the order of preferences, where feedback is
+    the entry the alternative was requested with (the response is None for failed requests).
+    Alternatives bypass the response cache, so asking again yields new suggestions.
+    """
+    feedback_history = feedback_history or []
+    feedback_items = [f"Requested different time: {preference}" for preference in preferences]
+    responses = await asyncio.gather(*[
+        get_llm_suggestion_async(schedule_context, user_request, timezone, feedback_history + [feedback],
+                                 disable_cache=True)
+        for feedback in feedback_items
+    ])
+    return list(zip(feedback_items, responses))
+
+class SchedulingChat:
+    """
+    One Gemini chat session per scheduling request. The first turn sends the full
+    prompt; follow-up turns only send the feedback added since the previous turn.
+    Turns depend on the conversation so far, so they bypass the response cache.
+    """
+
+    def __init__(self, schedule_context: str, user_request: str, timezone: str = 'UTC'):
+        self.schedule_context = schedule_context
+        self.user_request = user_request
+        self.timezone = timezone
+        self._chat = None
+        self._feedback_sent = 0  # Number of feedback items the chat has already seen
+
+    def _next_message(self, feedback_history: List[str]) -> str:
+        """Returns the full prompt for a new chat, otherwise only the new feedback."""
+        if self._chat is None:
+            return _build_prompt(self.schedule_context, self.user_request, self.timezone, feedback_history)
+        new_feedback = feedback_history[self._feedback_sent:]
+        if not new_feedback:
+            return "Suggest again following the same template."
+        return f"User feedback: {'; '.join(new_feedback)}. Suggest again following the same template."
+
+    def adopt(self, feedback_history: List[str], response: str) -> None:
+        """
+        Records a response obtained outside the chat (e.g. a picked alternative) as the
+        answer to feedback_history, so the next turn revises that suggestion.
+        """
+        model = _get_model()
+        if model is None:
+            return
+        message = self._next_message(feedback_history)
+        history = self._chat.history if self._chat is not None else []
+        self._chat = model.start_chat(history=[
+            *history,
+            {'role': 'user', 'parts': [message]},
+            {'role': 'model', 'parts': [response]},
+        ])
+        self._feedback_sent = len(feedback_history)
+
+    async def suggest(self, feedback_history: List[str] | None = None, on_chunk: Callable[[str], None] | None = None) -> str | None:
+        """
+        Requests a suggestion that takes feedback_history into account and returns the
+        raw text response, streaming it to on_chunk if given. Returns None on error.
+        """
+        feedback_history = feedback_history or []
+        message = self._next_message(feedback_history)
+        if self._chat is None:
+            model = _get_model()
+            if model is None:
+                return None
+            self._chat = model.start_chat(history=[])
+
+        try:
+            response = await self._chat.send_message_async(message, stream=True)
+            text = await _read_stream(response, on_chunk)
+        except Exception as e:
+            print(f"An unexpected error occurred while calling GenAI API: {e}")
+            # The chat history may be incomplete; start over with the full prompt next time
+            self._chat = None
+            self._feedback_sent = 0
+            return None
+
+        self._feedback_sent = len(feedback_history)
+        return text
+
+# Line patterns of the response template, matched once per line in parse_llm_response.
+# Parsing a full response takes tens of microseconds against seconds of generation, so
+# the parser stays pure Python; Numba does not help string code, and a compiled (Cython)
+# parser is only worth adding if long batched responses ever make this show up in profiles.
+_RE_SUGGESTED_HEADER = re.compile(r'^\*\*Suggested schedule:\*\*')
+_RE_SCHEDULE_HEADER = re.compile(r'^\*\*Schedule for\s*(?P<date>[^*:]*)')
+_RE_DATE_TIME = re.compile(r'^\*\s+Date and Time:\s*(?P<datetime>.*)$')
+# The template's "YYYY-MM-DD HH:MM", as strptime accepted it (one-digit hours allowed);
+# fromisoformat on its own would also take UTC offsets and return an aware datetime
+_RE_START_TIME = re.compile(r'(?P<date>\d{4}-\d{2}-\d{2})[ T](?P<hour>\d{1,2}):(?P<minute>\d{2})')
+_RE_DURATION = re.compile(r'^\*\s+Duration:\s*(?P<text>.*)$')
+# One "<amount> <unit>" part of a duration such as "1 hour 30 minutes"
+_RE_DURATION_PART = re.compile(
+    r'(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>hours?|hrs?|h|minutes?|mins?|m)(?![a-z])\s*(?:and\s+|,\s*)?',
+    re.IGNORECASE
+)
+_RE_BARE_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+_RE_EXPLANATION = re.compile(r'^\*\s+Explanation:\s*(?P<text>.*)$')
+_RE_SCHEDULE_EVENT = re.compile(r'^(?P<start>\d{1,2}:\d{2})\s*-\s*(?P<end>\d{1,2}:\d{2}):\s*(?P<description>.*)$')
+
+def _parse_duration_hours(text: str) -> float | None:
+    """
+    Converts a duration like '1.5 hours', '30 minutes' or '1 hour 30 minutes' to hours.
+    A bare number is taken as hours, the unit the template asks for. Returns None for
+    anything else (ranges, unknown units, trailing text) or a non-positive duration.
+    """
+    text = text.strip().rstrip('.')
+    if _RE_BARE_NUMBER.fullmatch(text):
+        hours = float(text)
+    else:
+        hours = 0.0
+        pos = 0
+        while pos < len(text):
+            match = _RE_DURATION_PART.match(text, pos)
+            if not match:
+                return None
+            amount = float(match['amount'])
+            hours += amount / 60 if match['unit'][0] in 'mM' else amount
+            pos = match.end()
+        if pos == 0:
+            return None
+    return hours if hours > 0 else None
+
+def _parse_suggested_line(line: str, result: Dict[str, Any], schedule_events: List[Dict[str, str]]) -> None:
+    """Handles a line of the **Suggested schedule:** section."""
+    match = _RE_DATE_TIME.match(line)
+    if match:
+        dt_str = match['datetime']
+        time_match = _RE_START_TIME.fullmatch(dt_str.strip())
+        start_time = None
+        if time_match:
+            try:
+                start_time = datetime.fromisoformat(
+                    f"{time_match['date']} {int(time_match['hour']):02d}:{time_match['minute']}"
+                )
+            except ValueError:
+                pass
+        if start_time is None:
+            print(f"Warning: Could not parse start time: {dt_str}")
+        else:
+            result['start_time'] = start_time
+        return
+    match = _RE_DURATION.match(line)
+    if match:
+        duration = _parse_duration_hours(match['text'])
+        if duration is None:
+            print(f"Warning: Could not parse duration: {match['text']}")
+        else:
+            result['duration'] = duration
+        return
+    match = _RE_EXPLANATION.match(line)
+    if match:
+        result['explanation'] = match['text']
+
+def _parse_schedule_line(line: str, result: Dict[str, Any], schedule_events: List[Dict[str, str]]) -> None:
+    """Handles a line of the **Schedule for ...** section."""
+    match = _RE_SCHEDULE_EVENT.match(line)
+    if match:
+        event_desc = match['description']
+        schedule_events.append({
+            'time_range': f"{match['start']} - {match['end']}",
+            'description': event_desc
+        })
+        # If this is the suggested event, extract its summary
+        desc_lower = event_desc.lower()
+        if 'suggested' in desc_lower or 'new' in desc_lower:
+            result['summary'] = event_desc
+
+# Line handler for each response section
+_HANDLERS = {
+    'suggested': _parse_suggested_line,
+    'schedule': _parse_schedule_line,
+}
+
 def parse_llm_response(response: str) -> Dict[str, Any]:
     """
     Parse the LLM response to extract event details from the current format.
@@ -164,9 +429,10 @@ def parse_llm_response(response: str) -> Dict[str, Any]:
         return None
 
     result = {}
-    current_section = None
+    handler = None
     schedule_events = []
-    date_str = None
+    match_suggested = _RE_SUGGESTED_HEADER.match
+    match_schedule = _RE_SCHEDULE_HEADER.match
 
     for line in response.split('\n'):
         line = line.strip()
@@ -174,60 +440,27 @@ def parse_llm_response(response: str) -> Dict[str, Any]:
             continue
 
         # Detect section headers
-        if line.startswith('**Suggested schedule:**'):
-            current_section = 'suggested'
+        if match_suggested(line):
+            handler = _HANDLERS['suggested']
             continue
-        elif line.startswith('**Schedule for'):
-            current_section = 'schedule'
+        match = match_schedule(line)
+        if match:
+            handler = _HANDLERS['schedule']
             # Extract date from header
             try:
-                date_str = line.split('for ')[1].strip('**:')
+                date_str = match['date'].strip()
                 result['schedule_day'] = {
-                    'date': datetime.strptime(date_str, '%Y-%m-%d').date(),
+                    'date': date.fromisoformat(date_str),
                     'events': []
                 }
-            except (IndexError, ValueError) as e:
+            except ValueError as e:
                 print(f"Warning: Could not parse schedule date from: {line}. Error: {e}")
             continue
 
-        if current_section == 'suggested':
-            if line.startswith('*   Date and Time:'):
-                try:
-                    dt_str = line.split('Time:')[1].strip()
-                    result['start_time'] = datetime.strptime(dt_str, '%Y-%m-%d %H:%M')
-                except (IndexError, ValueError):
-                    print(f"Warning: Could not parse start time: {dt_str}")
-            elif line.startswith('*   Duration:'):
-                try:
-                    duration_str = line.split('Duration:')[1].strip()
-                    # Remove 'hour' or 'hours' if present and convert to float
-                    duration_str = duration_str.replace('hours', '').replace('hour', '').strip()
-                    result['duration'] = float(duration_str)
-                except (IndexError, ValueError):
-                    print(f"Warning: Could not parse duration: {duration_str}")
-            elif line.startswith('*   Explanation:'):
-                result['explanation'] = line.split('Explanation:')[1].strip()
-        elif current_section == 'schedule':
-            if line.startswith('Day:'):
-                continue
-            elif ':' in line:  
-                try:
-                    time_part, event_desc = line.split(':', 1)
-                    time_parts = time_part.split(' - ')
-                    if len(time_parts) == 2:
-                        start_time, end_time = time_parts
-                        schedule_events.append({
-                            'time_range': f"{start_time.strip()} - {end_time.strip()}",
-                            'description': event_desc.strip()
-                        })
-                        # If this is the suggested event, extract its summary
-                        if 'suggested' in event_desc.lower() or 'new' in event_desc.lower():
-                            result['summary'] = event_desc.strip()
-                except Exception as e:
-                    print(f"Warning: Could not parse event line: {line}")
-                    print(f"Error: {e}")
+        if handler is not None:
+            handler(line, result, schedule_events)
 
     if 'schedule_day' in result:
         result['schedule_day']['events'] = schedule_events
 
-    return result 
\ No newline at end of file
+    return result
@@ -1,13 +1,23 @@
 import argparse
-import tzlocal
+import asyncio
+from bisect import insort
+from collections import defaultdict
 import os
-from datetime import datetime, timedelta
-import pytz
-from typing import List, Tuple
-from llm_scheduler import format_events_for_llm, get_llm_suggestion, parse_llm_response
-from google_calendar_api import create_event_from_llm_suggestion, get_events_from_google_calendar
+from datetime import date, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from typing import TYPE_CHECKING, List, Tuple
 
-def main():
+if TYPE_CHECKING:
+    import pytz
+
+@lru_cache(maxsize=64)
+def _tz(name: str) -> 'pytz.BaseTzInfo':
+    """Returns the pytz timezone for name, constructed once and cached."""
+    import pytz
+    return pytz.timezone(name)
+
+async def main():
     # Set up argument parsing
     parser = argparse.ArgumentParser(description="Fetch events from Google Calendar.")
     parser.add_argument('-u', '--use_hardcoded', action='store_true', help='Use hardcoded start date and duration')
@@ -27,8 +37,9 @@ def main():
         start_date = input("Enter the start date (YYYY-MM-DD): ")
         while True:
             try:
-                # Validate date format
-                datetime.strptime(start_date, '%Y-%m-%d')
+                # Validate the date and normalise it to YYYY-MM-DD, since fromisoformat
+                # also accepts forms like 20250417 that the calendar fetch doesn't
+                start_date = date.fromisoformat(start_date).isoformat()
                 break
             except ValueError:
                 start_date = input("Invalid date format. Please enter the start date (YYYY-MM-DD): ")
@@ -43,6 +54,14 @@ def main():
                 print(e)
                 days_ahead = input("Please enter a valid number of days to fetch events: ")
 
+    # Timezone libraries and the Google/Gemini modules are imported only once the
+    # arguments are in, so --help and input errors don't pay for them
+    import pytz
+    import tzlocal
+
+    # Look up the system timezone once
+    system_timezone = str(tzlocal.get_localzone())
+
     # Get timezone preference
     if args.ask_timezone:
         print("\nTimezone Selection:")
@@ -51,12 +70,12 @@ def main():
         while True:
             choice = input("Enter your choice (1/2): ").strip()
             if choice == "1":
-                timezone = str(tzlocal.get_localzone())
+                timezone = system_timezone
                 break
             elif choice == "2":
                 timezone = input("Enter timezone (e.g., 'Europe/Athens', 'America/New_York'): ").strip()
                 try:
-                    pytz.timezone(timezone)  # Validate timezone
+                    _tz(timezone)  # Validate timezone
                     break
                 except pytz.exceptions.UnknownTimeZoneError:
                     print("Invalid timezone. Please try again.")
@@ -64,7 +83,7 @@ def main():
                 print("Invalid choice. Please enter 1 or 2.")
     else:
         # Use system timezone by default
-        timezone = str(tzlocal.get_localzone())
+        timezone = system_timezone
 
     # List of calendar IDs to fetch events from
     # 'primary' is your main calendar
@@ -76,12 +95,16 @@ def main():
         # 'group.calendar.google.com',  # A group calendar
     ]
     
+    from event import Event
+    from google_calendar_api import create_event_from_llm_suggestion, get_events_from_google_calendar
+    from llm_scheduler import SchedulingChat, format_events_for_llm, get_llm_suggestions_batch, parse_llm_response
+
     try:
         print("\n" + "="*80)
         print("CALENDAR PARSER".center(80))
         print("="*80)
         print(f"\nFetching events from {len(calendar_ids)} calendars")
-        print(f"Date range: {start_date} to {(datetime.strptime(start_date, '%Y-%m-%d') + timedelta(days=days_ahead-1)).strftime('%Y-%m-%d')}")
+        print(f"Date range: {start_date} to {(date.fromisoformat(start_date) + timedelta(days=days_ahead-1)).isoformat()}")
         print(f"Timezone: {timezone}")
         
         all_events = get_events_from_google_calendar(start_date, days_ahead, timezone, calendar_ids)
@@ -105,15 +128,28 @@ def main():
     # Format events for LLM
     schedule_context = format_events_for_llm(all_events, timezone)
 
-    # Initialize feedback loop
+    # Group events by local day once so each suggestion only looks up its own day.
+    # Events arrive sorted by start time, so every day's list is sorted as well.
+    events_by_day = defaultdict(list)
+    for event in all_events:
+        events_by_day[event.start_local.date()].append(event)
+    timezone_obj = _tz(timezone)
+
+    # Initialize feedback loop; follow-up suggestions only send the new feedback to the chat
+    chat = SchedulingChat(schedule_context, user_request, timezone)
     feedback_history = []
+    next_response = None  # Response to show next instead of asking for a new one
     while True:
         print("\n" + "="*80)
         print("AI SCHEDULING ASSISTANT".center(80))
         print("="*80)
         
-        print("\nGenerating schedule suggestion...")
-        raw_llm_response = get_llm_suggestion(schedule_context, user_request, timezone, feedback_history)
+        if next_response is None:
+            print("\nGenerating schedule suggestion...\n")
+            raw_llm_response = await chat.suggest(feedback_history, on_chunk=lambda text: print(text, end='', flush=True))
+            print()
+        else:
+            raw_llm_response, next_response = next_response, None
 
         if raw_llm_response is not None:
             # Parse the LLM response
@@ -140,30 +176,35 @@ def main():
                 
                 # Get all events for the suggested day from the parsed ICS file
                 target_date = parsed_response['start_time'].date()
-                day_events = [event for event in all_events if event['start_local'].date() == target_date]
+                day_events = list(events_by_day.get(target_date, ()))
                 
                 # Create the new event object with timezone-aware datetimes
-                timezone_obj = pytz.timezone(timezone)
                 new_event_start = timezone_obj.localize(parsed_response['start_time'])
-                new_event = {
-                    'start_local': new_event_start,
-                    'end_local': new_event_start + timedelta(hours=parsed_response['duration']),
-                    'summary': event_title,
-                    'is_new': True,
-                    'timezone': timezone
-                }
+                new_event_end = new_event_start + timedelta(hours=parsed_response['duration'])
+                new_event = Event(
+                    summary=event_title,
+                    start_utc=new_event_start.astimezone(pytz.utc),
+                    end_utc=new_event_end.astimezone(pytz.utc),
+                    start_local=new_event_start,
+                    end_local=new_event_end,
+                    is_new=True,
+                    start_hm=f"{new_event_start:%H:%M}",
+                    end_hm=f"{new_event_end:%H:%M}"
+                )
                 
-                # Add the new event to the list and sort by start time
-                day_events.append(new_event)
-                day_events.sort(key=lambda x: x['start_local'])
+                # Insert the new event into the already sorted day
+                insort(day_events, new_event, key=attrgetter('start_local'))
                 
                 if day_events:
                     for event in day_events:
-                        time_range = f"{event['start_local'].strftime('%H:%M')} - {event['end_local'].strftime('%H:%M')}"
-                        if event.get('is_new'):
-                            print(f"{time_range}: {event['summary']} (NEW)")
+                        # Events from the ICS parser don't carry the cached display strings
+                        start_hm = event.start_hm or f"{event.start_local:%H:%M}"
+                        end_hm = event.end_hm or f"{event.end_local:%H:%M}"
+                        time_range = f"{start_hm} - {end_hm}"
+                        if event.is_new:
+                            print(f"{time_range}: {event.summary} (NEW)")
                         else:
-                            print(f"{time_range}: {event['summary']}")
+                            print(f"{time_range}: {event.summary}")
                 else:
                     print("No events scheduled for this day.")
                 
@@ -175,8 +216,9 @@ def main():
                 print("3. Request a different duration")
                 print("4. Provide specific constraints")
                 print("5. Cancel event creation")
+                print("6. Generate 3 alternatives")
                 
-                choice = input("\nEnter your choice (1-5): ").strip()
+                choice = input("\nEnter your choice (1-6): ").strip()
                 
                 if choice == "1":
                     print("\n" + "="*80)
@@ -213,6 +255,32 @@ def main():
                     print("EVENT CREATION CANCELLED".center(80))
                     print("="*80)
                     break
+                elif choice == "6":
+                    print("\n" + "-"*40)
+                    print("ALTERNATIVES".center(40))
+                    print("-"*40)
+                    print("Generating morning, afternoon and evening alternatives...")
+                    # All alternatives are requested concurrently
+                    alternatives = []
+                    for feedback, raw_alternative in await get_llm_suggestions_batch(schedule_context, user_request, timezone, feedback_history):
+                        parsed_alternative = parse_llm_response(raw_alternative)
+                        if parsed_alternative and 'start_time' in parsed_alternative and 'duration' in parsed_alternative:
+                            alternatives.append((feedback, raw_alternative, parsed_alternative))
+                    
+                    # Keep the current suggestion unless an alternative is picked
+                    next_response = raw_llm_response
+                    if not alternatives:
+                        print("Failed to generate alternatives.")
+                        continue
+                    
+                    for i, (_, _, alternative) in enumerate(alternatives, 1):
+                        print(f"{i}. {alternative['start_time']} ({alternative['duration']} hours): {alternative.get('explanation')}")
+                    pick = input(f"\nChoose an alternative (1-{len(alternatives)}) or press Enter to keep the current suggestion: ").strip()
+                    if pick.isdigit() and 1 <= int(pick) <= len(alternatives):
+                        # Keep the picked preference for later turns and let the chat revise this suggestion
+                        feedback, next_response, _ = alternatives[int(pick) - 1]
+                        feedback_history.append(feedback)
+                        chat.adopt(feedback_history, next_response)
                 else:
                     print("\nInvalid choice. Please try again.")
             else:
@@ -233,4 +301,4 @@ def main():
     print("="*80)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file